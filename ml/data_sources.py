@@ -0,0 +1,262 @@
+"""
+Data sources for the Sheba caregiver matching algorithm.
+
+The matcher reads seniors, caregivers and bookings through a data source
+so it can load only the subset it needs:
+- CSVDataSource: the flat CSV files written by convert_json_to_csv.py
+- SQLiteDataSource: an embedded, indexed SQLite store that several
+  processes can share
+
+Build the SQLite store from the CSV files with:
+
+    python data_sources.py --csv_dir data/mock --db data/mock/sheba.db
+
+Author: Sheba Development Team
+Date: November 2025
+"""
+
+import sqlite3
+import pandas as pd
+from contextlib import closing
+from pathlib import Path
+from typing import List
+
+DEFAULT_DATA_DIR = Path(__file__).parent / 'data' / 'mock'
+
+# Caregiver verification flags (stored as 0/1 in SQLite)
+VERIFICATION_COLUMNS = [
+    'nid_verified',
+    'background_check_passed',
+    'police_clearance'
+]
+
+# Indexes created in the SQLite store
+SQLITE_INDEXES = [
+    'CREATE UNIQUE INDEX IF NOT EXISTS idx_seniors_id ON seniors (id)',
+    'CREATE INDEX IF NOT EXISTS idx_seniors_area ON seniors (lower(area))',
+    'CREATE UNIQUE INDEX IF NOT EXISTS idx_caregivers_id ON caregivers (id)',
+    'CREATE INDEX IF NOT EXISTS idx_caregivers_area ON caregivers (district, lower(area))',
+    'CREATE INDEX IF NOT EXISTS idx_caregivers_lower_area ON caregivers (lower(area))',
+    'CREATE INDEX IF NOT EXISTS idx_caregivers_verification ON caregivers '
+    '(nid_verified, background_check_passed, police_clearance)',
+    'CREATE INDEX IF NOT EXISTS idx_caregivers_rating ON caregivers (average_rating)',
+    'CREATE INDEX IF NOT EXISTS idx_bookings_caregiver_date ON bookings '
+    '(caregiver_id, booking_date)',
+    'CREATE INDEX IF NOT EXISTS idx_bookings_date ON bookings (booking_date)',
+]
+
+
+class CSVDataSource:
+    """
+    Reads the flat CSV files in a data directory.
+
+    Filters are applied after reading the whole file, so every load
+    is a full scan. Use SQLiteDataSource for indexed access.
+    """
+
+    def __init__(self, data_dir: str = None):
+        """
+        Args:
+            data_dir: Directory containing seniors.csv, caregivers.csv
+                      and bookings.csv. Defaults to ml/data/mock/
+        """
+        self.data_dir = Path(data_dir) if data_dir else DEFAULT_DATA_DIR
+
+    def __repr__(self):
+        return f"CSVDataSource('{self.data_dir}')"
+
+    def load_seniors(self, areas: List[str] = None) -> pd.DataFrame:
+        """Load seniors, optionally restricted to some areas."""
+        df = pd.read_csv(self.data_dir / 'seniors.csv')
+        if areas:
+            df = df[df['area'].str.lower().isin([a.lower() for a in areas])]
+        return df.reset_index(drop=True)
+
+    def load_caregivers(self,
+                        district: str = None,
+                        areas: List[str] = None,
+                        verified_only: bool = False,
+                        min_rating: float = None) -> pd.DataFrame:
+        """
+        Load caregivers, optionally filtered.
+
+        Args:
+            district: Only caregivers in this district (e.g. 'Dhaka')
+            areas: Only caregivers in these areas
+            verified_only: Only caregivers passing all verification checks
+            min_rating: Only caregivers with average_rating >= min_rating
+        """
+        df = pd.read_csv(self.data_dir / 'caregivers.csv')
+        if district:
+            df = df[df['district'] == district]
+        if areas:
+            df = df[df['area'].str.lower().isin([a.lower() for a in areas])]
+        if verified_only:
+            df = df[df[VERIFICATION_COLUMNS].astype(bool).all(axis=1)]
+        if min_rating is not None:
+            df = df[df['average_rating'] >= min_rating]
+        return df.reset_index(drop=True)
+
+    def load_bookings(self,
+                      start_date: str = None,
+                      end_date: str = None,
+                      caregiver_ids: List[str] = None) -> pd.DataFrame:
+        """
+        Load bookings, optionally restricted to a date window
+        (inclusive, YYYY-MM-DD) and/or a set of caregivers.
+        """
+        df = pd.read_csv(self.data_dir / 'bookings.csv')
+        if start_date:
+            df = df[df['booking_date'] >= start_date]
+        if end_date:
+            df = df[df['booking_date'] <= end_date]
+        if caregiver_ids is not None:
+            df = df[df['caregiver_id'].isin(list(caregiver_ids))]
+        return df.reset_index(drop=True)
+
+
+class SQLiteDataSource:
+    """
+    Reads from an embedded SQLite store built by build_sqlite_store().
+
+    Caregivers are indexed by ID, area, verification flags and rating;
+    bookings by (caregiver_id, booking_date). Filters are pushed down
+    into SQL so only the matching rows are read into pandas.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        if not self.db_path.exists():
+            raise FileNotFoundError(
+                f"SQLite store not found: {self.db_path} "
+                f"(build it with: python data_sources.py --db {self.db_path})"
+            )
+
+    def __repr__(self):
+        return f"SQLiteDataSource('{self.db_path}')"
+
+    def _query(self, sql: str, params: list = None) -> pd.DataFrame:
+        """Run a read-only query and return the result as a DataFrame."""
+        # Read-only connection so several processes can share the store
+        uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+        with closing(sqlite3.connect(uri, uri=True)) as conn:
+            return pd.read_sql_query(sql, conn, params=params or [])
+
+    @staticmethod
+    def _in_clause(column: str, values: list) -> str:
+        """Build a parameterised 'column IN (?, ?, ...)' clause."""
+        return f"{column} IN ({', '.join('?' * len(values))})"
+
+    def load_seniors(self, areas: List[str] = None) -> pd.DataFrame:
+        """Load seniors, optionally restricted to some areas."""
+        sql = 'SELECT * FROM seniors'
+        params = []
+        if areas:
+            sql += ' WHERE ' + self._in_clause('lower(area)', areas)
+            params = [a.lower() for a in areas]
+        return self._query(sql, params)
+
+    def load_caregivers(self,
+                        district: str = None,
+                        areas: List[str] = None,
+                        verified_only: bool = False,
+                        min_rating: float = None) -> pd.DataFrame:
+        """
+        Load caregivers, optionally filtered (see CSVDataSource).
+        """
+        clauses = []
+        params = []
+        if district:
+            clauses.append('district = ?')
+            params.append(district)
+        if areas:
+            clauses.append(self._in_clause('lower(area)', areas))
+            params.extend(a.lower() for a in areas)
+        if verified_only:
+            clauses.extend(f'{col} = 1' for col in VERIFICATION_COLUMNS)
+        if min_rating is not None:
+            clauses.append('average_rating >= ?')
+            params.append(min_rating)
+
+        sql = 'SELECT * FROM caregivers'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+
+        df = self._query(sql, params)
+        for col in VERIFICATION_COLUMNS:
+            df[col] = df[col].astype(bool)
+        return df
+
+    def load_bookings(self,
+                      start_date: str = None,
+                      end_date: str = None,
+                      caregiver_ids: List[str] = None) -> pd.DataFrame:
+        """
+        Load bookings, optionally restricted to a date window
+        (inclusive, YYYY-MM-DD) and/or a set of caregivers.
+        """
+        clauses = []
+        params = []
+        if caregiver_ids is not None:
+            caregiver_ids = list(caregiver_ids)
+            if not caregiver_ids:
+                clauses.append('0')
+            else:
+                clauses.append(self._in_clause('caregiver_id', caregiver_ids))
+                params.extend(caregiver_ids)
+        if start_date:
+            clauses.append('booking_date >= ?')
+            params.append(start_date)
+        if end_date:
+            clauses.append('booking_date <= ?')
+            params.append(end_date)
+
+        sql = 'SELECT * FROM bookings'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        return self._query(sql, params)
+
+
+def build_sqlite_store(csv_dir: str = None, db_path: str = None) -> Path:
+    """
+    Build (or rebuild) the SQLite store from the CSV files.
+
+    Args:
+        csv_dir: Directory containing the CSV files. Defaults to ml/data/mock/
+        db_path: Output database file. Defaults to <csv_dir>/sheba.db
+
+    Returns:
+        Path to the database file
+    """
+    csv_dir = Path(csv_dir) if csv_dir else DEFAULT_DATA_DIR
+    db_path = Path(db_path) if db_path else csv_dir / 'sheba.db'
+
+    print(f"Building SQLite store at {db_path}...")
+
+    with closing(sqlite3.connect(db_path)) as conn:
+        for table in ['seniors', 'caregivers', 'bookings']:
+            df = pd.read_csv(csv_dir / f'{table}.csv')
+            df.to_sql(table, conn, if_exists='replace', index=False)
+            print(f"[OK] Stored {len(df)} {table}")
+
+        for statement in SQLITE_INDEXES:
+            conn.execute(statement)
+        conn.commit()
+
+    print(f"[OK] Created {len(SQLITE_INDEXES)} indexes")
+    return db_path
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build the Sheba SQLite data store')
+    parser.add_argument('--csv_dir', type=str, help='Directory containing the CSV files')
+    parser.add_argument('--db', type=str, help='Output SQLite database path')
+
+    args = parser.parse_args()
+    build_sqlite_store(args.csv_dir, args.db)
@@ -13,15 +13,25 @@ Date: November 2025
 
 import sys
 import io
+import json
+import time
+import heapq
+import base64
+import hashlib
+import secrets
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import List, Dict, Optional, Tuple
+import joblib
 from sklearn.preprocessing import MultiLabelBinarizer
 import warnings
 
+from data_sources import CSVDataSource, SQLiteDataSource
+from travel_time import TravelTimeTable
+
 # Fix encoding for Windows console
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -56,13 +66,119 @@ class CaregiverMatcher:
     # Earth radius in kilometers
     EARTH_RADIUS_KM = 6371.0
     
-    def __init__(self, data_dir: str = None):
+    # Travel-time decay (minutes) for the distance score when a road
+    # network is loaded
+    TRAVEL_TIME_DECAY_MIN = 20.0
+    
+    # Language/dialect score tiers (0-5)
+    SAME_AREA_SCORE = 5.0
+    RELATED_AREA_SCORE = 2.5
+    
+    # Neighbouring Dhaka areas that share local dialect
+    AREA_ADJACENCY = {
+        'mirpur': ['kalyanpur', 'shyamoli', 'agargaon', 'uttara'],
+        'kalyanpur': ['mirpur', 'shyamoli'],
+        'shyamoli': ['mirpur', 'kalyanpur', 'mohammadpur', 'agargaon'],
+        'mohammadpur': ['shyamoli', 'dhanmondi', 'agargaon'],
+        'agargaon': ['mirpur', 'shyamoli', 'mohammadpur', 'tejgaon'],
+        'dhanmondi': ['mohammadpur', 'mogbazar'],
+        'tejgaon': ['agargaon', 'gulshan', 'mogbazar', 'badda'],
+        'gulshan': ['banani', 'badda', 'tejgaon'],
+        'banani': ['gulshan', 'uttara'],
+        'uttara': ['banani', 'mirpur'],
+        'badda': ['gulshan', 'rampura', 'tejgaon'],
+        'rampura': ['badda', 'khilgaon', 'mogbazar'],
+        'khilgaon': ['rampura', 'motijheel'],
+        'motijheel': ['khilgaon', 'mogbazar'],
+        'mogbazar': ['motijheel', 'rampura', 'dhanmondi', 'tejgaon'],
+    }
+    
+    # Medical condition (Bengali) -> required service
+    CONDITION_TO_SERVICE = {
+        'ডায়াবেটিস': 'Diabetes Care',
+        'উচ্চ রক্তচাপ': 'Blood Pressure Monitoring',
+        'ডিমেনশিয়া': 'Dementia Care',
+        'পারকিনসন্স': 'Palliative Care',
+        'স্ট্রোক': 'Post-Surgery Care',
+        'আর্থ্রাইটিস': 'Mobility Assistance',
+        'হৃদরোগ': 'Nursing'
+    }
+    
+    # Service used for conditions without a specific mapping
+    DEFAULT_CONDITION_SERVICE = 'Personal Care'
+    
+    # Services every senior with medical conditions needs
+    BASIC_SERVICES = [
+        'Personal Care',
+        'Companionship',
+        'Medication Management'
+    ]
+    
+    # Required skills when nothing else is known
+    DEFAULT_SKILLS = ['Personal Care', 'Companionship']
+    
+    # Days of bookings paged in when a query falls outside the loaded dates
+    BOOKING_PAGE_DAYS = 7
+    
+    # Caregivers kept in each senior's materialized candidate list
+    CANDIDATE_LIST_SIZE = 300
+    
+    # Columns the candidate list scores depend on (see save_state)
+    CAREGIVER_SCORING_COLUMNS = [
+        'id', 'latitude', 'longitude', 'services', 'area', 'gender',
+        'average_rating', 'experience_years'
+    ]
+    SENIOR_SCORING_COLUMNS = [
+        'id', 'latitude', 'longitude', 'gender', 'area', 'medical_conditions'
+    ]
+    
+    # Paginated result sets kept in memory, and for how long
+    RESULT_CACHE_SIZE = 128
+    RESULT_CACHE_TTL_SEC = 300
+    
+    # Minimum number of caregivers ranked at a time when paginating
+    RANKING_CHUNK = 32
+    
+    # Query fields carried in a pagination cursor and their JSON types
+    CURSOR_QUERY_TYPES = {
+        'senior_id': str,
+        'senior_lat': (int, float),
+        'senior_lon': (int, float),
+        'required_skills': list,
+        'senior_gender': str,
+        'senior_area': str,
+        'booking_date': str,
+        'start_time': str,
+        'duration_hrs': (int, float)
+    }
+    
+    def __init__(self, data_dir: str = None,
+                 condition_to_service: Dict[str, str] = None,
+                 data_source=None,
+                 district: str = None,
+                 areas: List[str] = None,
+                 bookings_from: str = None,
+                 bookings_to: str = None,
+                 road_network: str = None,
+                 travel_cell_km: float = 0.5):
         """
         Initialize the matcher with CSV data.
         
         Args:
             data_dir: Path to directory containing CSV files. 
                      Defaults to ml/data/mock/
+            condition_to_service: Optional mapping of medical condition to
+                     required service. Defaults to CONDITION_TO_SERVICE
+            data_source: Optional data source (see data_sources.py).
+                     Defaults to CSVDataSource(data_dir)
+            district: Only load caregivers in this district
+            areas: Only load caregivers in these areas
+            bookings_from: Only load bookings on or after this date (YYYY-MM-DD)
+            bookings_to: Only load bookings on or before this date (YYYY-MM-DD)
+            road_network: Optional OSM XML extract (.osm). If given, the
+                     distance score uses road travel time instead of
+                     straight-line distance (see travel_time.py)
+            travel_cell_km: Grid cell size for precomputed travel times
         """
         if data_dir is None:
             data_dir = Path(__file__).parent / 'data' / 'mock'
@@ -70,20 +186,99 @@ class CaregiverMatcher:
             data_dir = Path(data_dir)
         
         self.data_dir = data_dir
+        self.data_source = data_source or CSVDataSource(data_dir)
+        self._result_cache = OrderedDict()
+        self.condition_to_service = dict(
+            condition_to_service if condition_to_service is not None
+            else self.CONDITION_TO_SERVICE
+        )
         
         # Load data
-        print("Loading data...")
-        self.seniors_df = pd.read_csv(data_dir / 'seniors.csv')
-        self.caregivers_df = pd.read_csv(data_dir / 'caregivers.csv')
-        self.bookings_df = pd.read_csv(data_dir / 'bookings.csv')
+        print(f"Loading data from {self.data_source}...")
+        self.caregiver_filters = {
+            k: v for k, v in {'district': district, 'areas': areas}.items() if v
+        }
+        self.seniors_df = self.data_source.load_seniors()
+        self.caregivers_df = self.data_source.load_caregivers(
+            **self.caregiver_filters
+        )
+        
+        # Precomputed caregiver -> grid cell travel times (cached on disk)
+        self.travel_times = None
+        if road_network:
+            self.travel_times = TravelTimeTable.load_or_build(
+                road_network,
+                self.caregivers_df['latitude'].to_numpy(dtype=float),
+                self.caregivers_df['longitude'].to_numpy(dtype=float),
+                cell_size_km=travel_cell_km
+            )
         
         # Preprocess data
         self._preprocess_data()
+        self.load_bookings(bookings_from, bookings_to)
         
         print(f"[OK] Loaded {len(self.seniors_df)} seniors")
         print(f"[OK] Loaded {len(self.caregivers_df)} caregivers")
         print(f"[OK] Loaded {len(self.bookings_df)} bookings")
     
+    def load_bookings(self, start_date: str = None, end_date: str = None):
+        """
+        (Re)load bookings for the loaded caregivers, optionally limited
+        to a date window (inclusive, YYYY-MM-DD), replacing any bookings
+        already loaded.
+        
+        Matching for a date outside the loaded ranges pages in the week
+        starting at that date and merges it in (see BOOKING_PAGE_DAYS).
+        """
+        self.bookings_df = self._read_bookings(start_date, end_date)
+        
+        # Loaded (start, end) date ranges; None is unbounded
+        self.bookings_ranges = [(
+            pd.to_datetime(start_date) if start_date else None,
+            pd.to_datetime(end_date) if end_date else None
+        )]
+    
+    def _read_bookings(self, start_date: str = None,
+                       end_date: str = None) -> pd.DataFrame:
+        """Read bookings for the loaded caregivers from the data source."""
+        # Only restrict by caregiver when a subset of caregivers is loaded
+        caregiver_ids = None
+        if self.caregiver_filters:
+            caregiver_ids = self.caregivers_df['id'].tolist()
+        
+        bookings = self.data_source.load_bookings(
+            start_date=start_date,
+            end_date=end_date,
+            caregiver_ids=caregiver_ids
+        )
+        
+        # Convert booking dates to datetime
+        bookings['booking_date'] = pd.to_datetime(bookings['booking_date'])
+        return bookings
+    
+    def _ensure_bookings_loaded(self, booking_date: str):
+        """Page in and merge bookings if booking_date is not loaded yet."""
+        req_date = pd.to_datetime(booking_date)
+        
+        for start, end in self.bookings_ranges:
+            if (start is None or req_date >= start) and \
+                    (end is None or req_date <= end):
+                return
+        
+        # Stop short of the next loaded range so no booking is read twice
+        page_end = req_date + timedelta(days=self.BOOKING_PAGE_DAYS - 1)
+        for start, _ in self.bookings_ranges:
+            if start is not None and req_date < start <= page_end:
+                page_end = start - timedelta(days=1)
+        
+        print(f"Paging in bookings for {req_date:%Y-%m-%d} - {page_end:%Y-%m-%d}")
+        page = self._read_bookings(
+            req_date.strftime('%Y-%m-%d'), page_end.strftime('%Y-%m-%d')
+        )
+        if len(page):
+            self.bookings_df = pd.concat([self.bookings_df, page], ignore_index=True)
+        self.bookings_ranges.append((req_date, page_end))
+    
     def _preprocess_data(self):
         """Preprocess and prepare data for matching."""
         # Parse services/skills for caregivers
@@ -92,6 +287,20 @@ class CaregiverMatcher:
         )
         
         # Build skill vectors using one-hot encoding
+        self._build_skill_vectors()
+        
+        # Intern areas to integer codes and build similarity table
+        self._build_area_table()
+        
+        # Keyed senior profiles with precomputed requirements
+        self._build_senior_index()
+        
+        # Ranked candidate caregivers per registered senior, built on
+        # first use (see build_candidate_lists)
+        self.candidate_lists = {}
+    
+    def _build_skill_vectors(self):
+        """Build the skill vocabulary and one-hot caregiver skill vectors."""
         all_skills = set()
         for skills in self.caregivers_df['services_list']:
             all_skills.update(skills)
@@ -104,11 +313,490 @@ class CaregiverMatcher:
         self.skill_vectors = self.mlb.fit_transform(
             self.caregivers_df['services_list']
         )
+    
+    @staticmethod
+    def _normalize_area(area) -> Optional[str]:
+        """Normalize an area name for vocabulary lookup."""
+        if pd.isna(area):
+            return None
+        area = str(area).strip().lower()
+        return area or None
+    
+    def _build_area_table(self):
+        """
+        Intern all known areas and precompute the area similarity table.
         
-        # Convert booking dates to datetime
-        self.bookings_df['booking_date'] = pd.to_datetime(
-            self.bookings_df['booking_date']
+        area_similarity[i, j] holds the language score (0-5) between
+        area codes i and j, so scoring a query is a single array gather.
+        """
+        self.area_names = []
+        self.area_codes = {}
+        self.area_similarity = np.zeros((0, 0))
+        
+        areas = pd.concat([
+            self.seniors_df['area'], self.caregivers_df['area']
+        ])
+        for area in areas:
+            self._area_code(area)
+        
+        self.caregiver_area_codes = np.array(
+            [self._area_code(a) for a in self.caregivers_df['area']],
+            dtype=np.int32
+        )
+        print(f"[OK] Indexed {len(self.area_names)} unique areas")
+    
+    def _area_code(self, area) -> int:
+        """
+        Return the integer code for an area, extending the vocabulary
+        and similarity table if the area has not been seen before.
+        
+        Returns -1 for missing areas.
+        """
+        name = self._normalize_area(area)
+        if name is None:
+            return -1
+        
+        code = self.area_codes.get(name)
+        if code is not None:
+            return code
+        
+        code = len(self.area_names)
+        self.area_names.append(name)
+        self.area_codes[name] = code
+        
+        # Grow the table by one row and column
+        row = np.array([
+            self._area_similarity(name, other) for other in self.area_names
+        ])
+        table = np.zeros((code + 1, code + 1))
+        table[:code, :code] = self.area_similarity
+        table[code, :] = row
+        table[:, code] = row
+        self.area_similarity = table
+        
+        return code
+    
+    def _area_similarity_row(self, area) -> Optional[np.ndarray]:
+        """
+        Language scores between an area and every known area code.
+        
+        Known areas read their row of the table. Areas not in the
+        vocabulary (e.g. free text from a query) are scored on the fly
+        without being added, so queries never grow the table.
+        
+        Returns None for missing areas.
+        """
+        name = self._normalize_area(area)
+        if name is None:
+            return None
+        
+        code = self.area_codes.get(name)
+        if code is not None:
+            return self.area_similarity[code]
+        
+        return np.array([
+            self._area_similarity(name, other) for other in self.area_names
+        ])
+    
+    def _area_similarity(self, area_a: str, area_b: str) -> float:
+        """
+        Language score between two normalized area names.
+        
+        Same area = 5 points; shared name token or neighbouring
+        area = 2.5 points.
+        """
+        if area_a == area_b:
+            return self.SAME_AREA_SCORE
+        
+        if set(area_a.split()) & set(area_b.split()):
+            return self.RELATED_AREA_SCORE
+        
+        if (area_b in self.AREA_ADJACENCY.get(area_a, []) or
+                area_a in self.AREA_ADJACENCY.get(area_b, [])):
+            return self.RELATED_AREA_SCORE
+        
+        return 0.0
+    
+    def _required_skills_for_conditions(self, medical_conditions) -> List[str]:
+        """
+        Derive required services from a '|'-separated list of
+        medical conditions using the condition-to-service table.
+        """
+        if pd.isna(medical_conditions) or not str(medical_conditions).strip():
+            return list(self.DEFAULT_SKILLS)
+        
+        required_skills = {
+            self.condition_to_service.get(
+                c.strip(), self.DEFAULT_CONDITION_SERVICE
+            )
+            for c in str(medical_conditions).split('|')
+        }
+        required_skills.update(self.BASIC_SERVICES)
+        return sorted(required_skills)
+    
+    def _skill_vector(self, skills: List[str]) -> np.ndarray:
+        """One-hot skill vector over all_skills (unknown skills ignored)."""
+        known = [s for s in skills if s in self.all_skills]
+        return self.mlb.transform([known])[0]
+    
+    def _build_senior_index(self):
+        """
+        Build a senior_id -> profile index with coordinates, area code,
+        gender and precomputed required skills, plus row-aligned arrays
+        of the same fields for vectorized scoring.
+        """
+        self.senior_index = {}
+        
+        for position, senior in enumerate(self.seniors_df.itertuples(index=False)):
+            required_skills = self._required_skills_for_conditions(
+                getattr(senior, 'medical_conditions', None)
+            )
+            self.senior_index[senior.id] = {
+                'position': position,
+                'latitude': senior.latitude,
+                'longitude': senior.longitude,
+                'gender': senior.gender,
+                'area': senior.area,
+                'area_code': self._area_code(senior.area),
+                'required_skills': required_skills,
+                'skill_vector': self._skill_vector(required_skills)
+            }
+        
+        profiles = list(self.senior_index.values())
+        self.senior_ids = list(self.senior_index.keys())
+        self.senior_coords = np.array(
+            [[p['latitude'], p['longitude']] for p in profiles], dtype=float
+        ).reshape(-1, 2)
+        self.senior_genders = np.array([p['gender'] for p in profiles], dtype=object)
+        self.senior_area_codes = np.array(
+            [p['area_code'] for p in profiles], dtype=np.int32
+        )
+        self.senior_skill_matrix = np.array(
+            [p['skill_vector'] for p in profiles]
+        ).reshape(-1, len(self.all_skills))
+    
+    def get_senior_profile(self, senior_id: str) -> Dict:
+        """
+        Look up a senior's precomputed profile.
+        
+        Raises:
+            ValueError: If the senior ID is unknown
+        """
+        profile = self.senior_index.get(senior_id)
+        if profile is None:
+            raise ValueError(f"Unknown senior_id: {senior_id}")
+        return profile
+    
+    def _pair_scores(self, senior_rows: np.ndarray,
+                     caregiver_rows: np.ndarray) -> np.ndarray:
+        """
+        Query-independent total scores (everything except availability)
+        for registered seniors x caregivers, using each senior's derived
+        skills. Caregivers without a location score -inf.
+        
+        Returns:
+            Array of shape (len(senior_rows), len(caregiver_rows))
+        """
+        senior_rows = np.asarray(senior_rows, dtype=int)
+        codes = self.senior_area_codes[senior_rows]
+        area_rows = np.where(
+            (codes >= 0)[:, None],
+            self.area_similarity[np.clip(codes, 0, None)] if len(self.area_names)
+            else np.zeros((len(codes), 0)),
+            0.0
         )
+        
+        components = self._component_scores(
+            self.senior_coords[senior_rows, 0],
+            self.senior_coords[senior_rows, 1],
+            self.senior_skill_matrix[senior_rows],
+            self.senior_genders[senior_rows],
+            area_rows,
+            caregiver_rows
+        )
+        scores = self._total_score(components)
+        return np.where(np.isnan(components['distance_km']), -np.inf, scores)
+    
+    def build_candidate_lists(self, senior_ids: List[str] = None):
+        """
+        Precompute, for each registered senior, the top
+        CANDIDATE_LIST_SIZE caregivers ranked by query-independent score.
+        
+        Each list holds caregiver row indices and scores in descending
+        order. Every caregiver left out of a list scores no higher than
+        the list's last entry; 'complete' marks lists holding all
+        located caregivers.
+        
+        Lists are otherwise built one senior at a time on their first
+        query; call this to build them all up front (e.g. before
+        save_state()).
+        
+        Args:
+            senior_ids: Seniors to (re)build. Defaults to all seniors
+        """
+        build_all = senior_ids is None
+        if build_all:
+            self.candidate_lists = {}
+            senior_ids = self.senior_ids
+        
+        caregiver_rows = np.arange(len(self.caregivers_df))
+        
+        # Chunk seniors to bound the size of the score matrix
+        for start in range(0, len(senior_ids), 256):
+            chunk = senior_ids[start:start + 256]
+            rows = [self.senior_index[sid]['position'] for sid in chunk]
+            scores = self._pair_scores(rows, caregiver_rows)
+            
+            for sid, row_scores in zip(chunk, scores):
+                located = np.flatnonzero(np.isfinite(row_scores))
+                order = located[np.argsort(-row_scores[located], kind='stable')]
+                order = order[:self.CANDIDATE_LIST_SIZE]
+                self.candidate_lists[sid] = {
+                    'caregivers': order,
+                    'scores': row_scores[order],
+                    'complete': len(order) == len(located)
+                }
+        
+        if build_all:
+            print(f"[OK] Materialized candidate lists for {len(senior_ids)} seniors")
+    
+    def _update_candidate_lists(self, caregiver_idx: int):
+        """
+        Re-rank one caregiver in every built candidate list after it
+        was added or changed. Lists it neither enters nor leaves are
+        left untouched.
+        """
+        senior_ids = list(self.candidate_lists)
+        if not senior_ids:
+            return
+        
+        rows = [self.senior_index[sid]['position'] for sid in senior_ids]
+        scores = self._pair_scores(rows, [caregiver_idx])[:, 0]
+        updated = 0
+        rebuild = []
+        
+        for sid, score in zip(senior_ids, scores):
+            entry = self.candidate_lists[sid]
+            caregivers, list_scores = entry['caregivers'], entry['scores']
+            
+            present = caregivers == caregiver_idx
+            was_listed = present.any()
+            caregivers, list_scores = caregivers[~present], list_scores[~present]
+            
+            # Keep the invariant: nobody outside the list outranks its tail
+            listed = np.isfinite(score) and (
+                entry['complete'] or
+                (len(caregivers) > 0 and score >= list_scores[-1])
+            )
+            if not (was_listed or listed):
+                continue
+            
+            if listed:
+                pos = np.searchsorted(-list_scores, -score, side='right')
+                caregivers = np.insert(caregivers, pos, caregiver_idx)
+                list_scores = np.insert(list_scores, pos, score)
+            
+            if len(caregivers) > self.CANDIDATE_LIST_SIZE:
+                caregivers = caregivers[:self.CANDIDATE_LIST_SIZE]
+                list_scores = list_scores[:self.CANDIDATE_LIST_SIZE]
+                entry['complete'] = False
+            
+            entry['caregivers'], entry['scores'] = caregivers, list_scores
+            updated += 1
+            
+            # Lists that shrank too far are rebuilt from scratch
+            if (not entry['complete'] and
+                    len(caregivers) < self.CANDIDATE_LIST_SIZE // 2):
+                rebuild.append(sid)
+        
+        if rebuild:
+            self.build_candidate_lists(rebuild)
+        
+        print(f"[OK] Updated candidate lists for {updated} seniors")
+    
+    def add_caregiver(self, caregiver: Dict) -> int:
+        """
+        Add a caregiver and update the affected candidate lists.
+        
+        Args:
+            caregiver: Row with the same columns as caregivers.csv
+        
+        Returns:
+            Row index of the new caregiver
+        """
+        if caregiver['id'] in set(self.caregivers_df['id']):
+            raise ValueError(f"Caregiver already exists: {caregiver['id']}")
+        
+        services = caregiver.get('services')
+        row = dict(caregiver)
+        row['services_list'] = services.split('|') if pd.notna(services) else []
+        
+        self.caregivers_df = pd.concat(
+            [self.caregivers_df, pd.DataFrame([row])], ignore_index=True
+        )
+        idx = len(self.caregivers_df) - 1
+        self.caregiver_area_codes = np.append(
+            self.caregiver_area_codes, self._area_code(row.get('area'))
+        ).astype(np.int32)
+        if self.travel_times is not None:
+            self.travel_times.set_caregiver(
+                idx, row.get('latitude', np.nan), row.get('longitude', np.nan)
+            )
+        
+        if set(row['services_list']) - set(self.all_skills):
+            # New skills change every skill vector; rebuild from scratch
+            self._build_skill_vectors()
+            self._build_senior_index()
+            self.candidate_lists = {}
+        else:
+            self.skill_vectors = np.vstack(
+                [self.skill_vectors, self._skill_vector(row['services_list'])]
+            )
+            self._update_candidate_lists(idx)
+        
+        return idx
+    
+    def update_caregiver(self, caregiver_id: str, **fields):
+        """
+        Update a caregiver (e.g. latitude/longitude after a move, or
+        average_rating after a review) and the affected candidate lists.
+        
+        Raises:
+            ValueError: If the caregiver ID is unknown
+        """
+        matches = np.flatnonzero(self.caregivers_df['id'] == caregiver_id)
+        if len(matches) == 0:
+            raise ValueError(f"Unknown caregiver_id: {caregiver_id}")
+        idx = int(matches[0])
+        
+        for column, value in fields.items():
+            self.caregivers_df.at[idx, column] = value
+        
+        if 'area' in fields:
+            self.caregiver_area_codes[idx] = self._area_code(fields['area'])
+        
+        if self.travel_times is not None and ('latitude' in fields or 'longitude' in fields):
+            self.travel_times.set_caregiver(
+                idx,
+                self.caregivers_df.at[idx, 'latitude'],
+                self.caregivers_df.at[idx, 'longitude']
+            )
+        
+        if 'services' in fields:
+            services = fields['services']
+            skills = services.split('|') if pd.notna(services) else []
+            self.caregivers_df.at[idx, 'services_list'] = skills
+            if set(skills) - set(self.all_skills):
+                self._build_skill_vectors()
+                self._build_senior_index()
+                self.candidate_lists = {}
+                return
+            self.skill_vectors[idx] = self._skill_vector(skills)
+        
+        self._update_candidate_lists(idx)
+    
+    def _match_from_candidates(self, senior_id: str, query: Dict,
+                               top_n: int) -> List[Dict]:
+        """
+        Serve a registered senior's query from the materialized list.
+        
+        Walks the list in score order checking availability until top_n
+        available caregivers are found. Returns None if the list cannot
+        guarantee the same result as a full scan.
+        """
+        if senior_id not in self.senior_index:
+            return None
+        if senior_id not in self.candidate_lists:
+            self.build_candidate_lists([senior_id])
+        entry = self.candidate_lists[senior_id]
+        
+        scored = []
+        available = 0
+        threshold = None
+        for idx, score in zip(entry['caregivers'], entry['scores']):
+            # Past the N-th available match, only score ties still matter
+            if threshold is not None and round(score, 2) < threshold:
+                break
+            _, match = self._score_caregiver(idx, query)
+            scored.append((idx, match))
+            available += match['available']
+            if available == top_n and match['available']:
+                threshold = match['total_score']
+        else:
+            # Too few available caregivers in the list: only exact if it
+            # holds everyone (busy caregivers outside could be outranked)
+            if threshold is None and not entry['complete']:
+                return None
+        
+        # Rank in caregiver order so ties resolve like a full scan
+        matches = [match for _, match in sorted(scored, key=lambda x: x[0])]
+        return self._rank_matches(matches)[:top_n]
+    
+    def _scoring_fingerprint(self) -> str:
+        """
+        Digest of every input the candidate list scores depend on:
+        caregiver and senior scoring columns, the condition-to-service
+        table and the travel-time configuration.
+        """
+        digest = hashlib.sha1()
+        for df, columns in [(self.caregivers_df, self.CAREGIVER_SCORING_COLUMNS),
+                            (self.seniors_df, self.SENIOR_SCORING_COLUMNS)]:
+            columns = [col for col in columns if col in df.columns]
+            digest.update(','.join(columns).encode('utf-8'))
+            digest.update(
+                pd.util.hash_pandas_object(df[columns], index=False).to_numpy().tobytes()
+            )
+        digest.update(
+            json.dumps(sorted(self.condition_to_service.items())).encode('utf-8')
+        )
+        travel = self.travel_times.fingerprint() if self.travel_times is not None else ''
+        digest.update(travel.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def save_state(self, path: str):
+        """
+        Persist precomputed matcher state (area vocabulary, similarity
+        table and the candidate lists built so far) so it can be reused
+        across processes.
+        """
+        state = {
+            'area_names': self.area_names,
+            'area_similarity': self.area_similarity,
+            'scoring_fingerprint': self._scoring_fingerprint(),
+            'candidate_lists': self.candidate_lists,
+        }
+        joblib.dump(state, path)
+        print(f"[OK] Saved matcher state to {path}")
+    
+    def load_state(self, path: str):
+        """
+        Load matcher state saved by save_state().
+        
+        Areas present in the loaded data but missing from the saved
+        table are appended, and area codes are re-interned. Candidate
+        lists are only restored if they were built from the same scoring
+        inputs (caregiver and senior data, condition-to-service table
+        and travel-time configuration); otherwise they are dropped and
+        rebuilt on first use.
+        """
+        state = joblib.load(path)
+        self.area_names = list(state['area_names'])
+        self.area_codes = {
+            name: code for code, name in enumerate(self.area_names)
+        }
+        self.area_similarity = np.asarray(state['area_similarity'])
+        
+        self.caregiver_area_codes = np.array(
+            [self._area_code(a) for a in self.caregivers_df['area']],
+            dtype=np.int32
+        )
+        self._build_senior_index()
+        
+        if state.get('scoring_fingerprint') == self._scoring_fingerprint():
+            self.candidate_lists = state['candidate_lists']
+        else:
+            self.candidate_lists = {}
+        print(f"[OK] Loaded matcher state from {path}")
     
     @staticmethod
     def haversine_distance(lat1: float, lon1: float, 
@@ -138,104 +826,191 @@ class CaregiverMatcher:
         
         return CaregiverMatcher.EARTH_RADIUS_KM * c
     
-    def _calculate_distance_score(self, distance_km: float) -> float:
+    def _calculate_distance_score(self, distance_km):
         """
         Convert distance to a score (0-30).
         Closer caregivers get higher scores.
         
         Uses exponential decay: score = 30 * e^(-distance/10)
+        Accepts a scalar or an array; missing distances score 0.
         """
-        if pd.isna(distance_km):
-            return 0.0
+        distance_km = np.asarray(distance_km, dtype=float)
         
         # Exponential decay - 10km half-life
-        score = 30.0 * np.exp(-distance_km / 10.0)
-        return max(0.0, min(30.0, score))
+        score = np.clip(30.0 * np.exp(-distance_km / 10.0), 0.0, 30.0)
+        score = np.where(np.isnan(distance_km), 0.0, score)
+        return float(score) if score.ndim == 0 else score
     
-    def _calculate_skill_score(self, senior_skills: List[str], 
-                               caregiver_idx: int) -> float:
+    def _calculate_travel_time_score(self, minutes):
+        """
+        Convert road travel time to a distance score (0-30).
+        
+        Uses exponential decay: score = 30 * e^(-minutes/TRAVEL_TIME_DECAY_MIN)
+        Unreachable caregivers (infinite time) score 0.
+        """
+        minutes = np.asarray(minutes, dtype=float)
+        score = 30.0 * np.exp(-minutes / self.TRAVEL_TIME_DECAY_MIN)
+        score = np.where(np.isnan(minutes), 0.0, score)
+        return float(score) if score.ndim == 0 else score
+    
+    def _calculate_skill_score(self, senior_vectors: np.ndarray, 
+                               caregiver_rows: np.ndarray) -> np.ndarray:
         """
         Calculate skill similarity using cosine similarity (0-25).
         
         Args:
-            senior_skills: List of required skills
-            caregiver_idx: Index of caregiver in caregivers_df
+            senior_vectors: Required-skill vectors from _skill_vector(),
+                            shape (seniors, skills)
+            caregiver_rows: Row indices into caregivers_df
         
         Returns:
-            Skill similarity score (0-25)
+            Skill similarity scores, shape (seniors, caregivers)
         """
-        if not senior_skills:
-            return 0.0
+        senior_vectors = np.asarray(senior_vectors, dtype=float)
+        caregiver_vectors = self.skill_vectors[caregiver_rows].astype(float)
         
-        # Create skill vector for senior requirements
-        senior_vector = self.mlb.transform([senior_skills])
-        caregiver_vector = self.skill_vectors[caregiver_idx].reshape(1, -1)
-        
-        # Calculate cosine similarity
-        similarity = cosine_similarity(senior_vector, caregiver_vector)[0][0]
+        # Calculate cosine similarity (0 for empty skill sets)
+        norms = (np.linalg.norm(senior_vectors, axis=1)[:, None] *
+                 np.linalg.norm(caregiver_vectors, axis=1)[None, :])
+        dots = senior_vectors @ caregiver_vectors.T
+        similarity = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
         
         # Scale to 0-25
         return similarity * 25.0
     
-    def _calculate_rating_score(self, rating: float) -> float:
+    def _calculate_rating_score(self, ratings: np.ndarray) -> np.ndarray:
         """
-        Convert rating (0-5) to score (0-20).
+        Convert ratings (0-5) to scores (0-20). Missing ratings score 0.
         """
-        if pd.isna(rating):
-            return 0.0
+        ratings = np.asarray(ratings, dtype=float)
         
         # Linear scaling: 5-star = 20 points
-        return (rating / 5.0) * 20.0
+        return np.where(np.isnan(ratings), 0.0, (ratings / 5.0) * 20.0)
     
-    def _calculate_experience_score(self, years: int) -> float:
+    def _calculate_experience_score(self, years: np.ndarray) -> np.ndarray:
         """
-        Convert years of experience to score (0-15).
+        Convert years of experience to scores (0-15).
         
         Uses logarithmic scaling to reward experience 
         but with diminishing returns.
         """
-        if pd.isna(years) or years <= 0:
-            return 0.0
+        years = np.asarray(years, dtype=float)
         
         # Log scaling: 15 years+ = max score
-        score = 15.0 * np.log1p(years) / np.log1p(15)
-        return min(15.0, score)
+        score = np.minimum(
+            15.0, 15.0 * np.log1p(np.clip(years, 0, None)) / np.log1p(15)
+        )
+        return np.where(years > 0, score, 0.0)
     
-    def _calculate_gender_score(self, senior_gender: str, 
-                                caregiver_gender: str) -> float:
+    def _calculate_gender_score(self, senior_genders: np.ndarray, 
+                                caregiver_genders: np.ndarray) -> np.ndarray:
         """
-        Calculate gender match score (0-5).
+        Calculate gender match scores (0-5), shape (seniors, caregivers).
         
-        Returns 5 if genders match, 0 otherwise.
+        5 if genders match, 0 otherwise or if either is missing.
         """
-        if pd.isna(senior_gender) or pd.isna(caregiver_gender):
-            return 0.0
-        
-        return 5.0 if senior_gender == caregiver_gender else 0.0
+        senior_genders = np.asarray(senior_genders, dtype=object)
+        caregiver_genders = np.asarray(caregiver_genders, dtype=object)
+        same_gender = (
+            (senior_genders[:, None] == caregiver_genders[None, :]) &
+            ~pd.isna(senior_genders)[:, None] & ~pd.isna(caregiver_genders)[None, :]
+        )
+        return np.where(same_gender, 5.0, 0.0)
     
-    def _calculate_language_score(self, senior_area: str, 
-                                  caregiver_area: str) -> float:
+    def _calculate_language_score(self, senior_area_rows: np.ndarray, 
+                                  caregiver_area_codes: np.ndarray) -> np.ndarray:
+        """
+        Calculate language/dialect match scores (0-5).
+        
+        Uses area as proxy for Bengali dialect familiarity and gathers
+        each senior's row of the area similarity table (see
+        _area_similarity_row; all zeros for a missing area) for all
+        caregivers at once. Caregivers without an area (code -1) score 0.
+        
+        Returns:
+            Scores of shape (seniors, caregivers)
         """
-        Calculate language/dialect match score (0-5).
+        caregiver_area_codes = np.asarray(caregiver_area_codes)
+        senior_area_rows = np.asarray(senior_area_rows, dtype=float)
+        if senior_area_rows.shape[1] == 0:
+            return np.zeros((len(senior_area_rows), len(caregiver_area_codes)))
         
-        Uses area/district as proxy for Bengali dialect familiarity.
-        Same area = 5 points, same district = 2.5 points.
+        scores = senior_area_rows[:, np.clip(caregiver_area_codes, 0, None)]
+        return np.where(caregiver_area_codes[None, :] >= 0, scores, 0.0)
+    
+    def _component_scores(self, lats: np.ndarray, lons: np.ndarray,
+                          skill_vectors: np.ndarray, genders: np.ndarray,
+                          area_rows: np.ndarray,
+                          caregiver_rows: np.ndarray) -> Dict[str, np.ndarray]:
         """
-        if pd.isna(senior_area) or pd.isna(caregiver_area):
-            return 0.0
+        Score components (everything except availability) between
+        seniors/query points and caregivers. All scoring paths use this,
+        so every formula lives in one place.
         
-        # Exact area match
-        if senior_area.lower() == caregiver_area.lower():
-            return 5.0
+        With a road network loaded, points inside the travel-time grid
+        get their distance score from travel time (a table lookup);
+        others fall back to straight-line distance.
         
-        # Same general region (partial match)
-        senior_parts = senior_area.lower().split()
-        caregiver_parts = caregiver_area.lower().split()
+        Args:
+            lats, lons: Point coordinates, shape (seniors,)
+            skill_vectors: Required-skill vectors, shape (seniors, skills)
+            genders: Senior genders, shape (seniors,)
+            area_rows: Area similarity rows, shape (seniors, areas)
+            caregiver_rows: Row indices into caregivers_df
         
-        if any(part in caregiver_parts for part in senior_parts):
-            return 2.5
+        Returns:
+            Dictionary of (seniors, caregivers) arrays: distance_km (NaN
+            for caregivers without a location), travel_min (None without
+            a road network, NaN outside the grid) and the distance,
+            skill, rating, experience, gender and language scores
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        caregiver_rows = np.asarray(caregiver_rows, dtype=int)
+        caregivers = self.caregivers_df.iloc[caregiver_rows]
+        shape = (len(lats), len(caregiver_rows))
         
-        return 0.0
+        distances = self.haversine_distance(
+            lats[:, None], lons[:, None],
+            caregivers['latitude'].to_numpy(dtype=float)[None, :],
+            caregivers['longitude'].to_numpy(dtype=float)[None, :]
+        )
+        distance_scores = self._calculate_distance_score(distances)
+        
+        travel = None
+        if self.travel_times is not None:
+            travel = self.travel_times.minutes_to(lats, lons)[caregiver_rows].T
+            distance_scores = np.where(
+                np.isnan(travel), distance_scores,
+                self._calculate_travel_time_score(travel)
+            )
+        
+        return {
+            'distance_km': distances,
+            'travel_min': travel,
+            'distance': distance_scores,
+            'skill': self._calculate_skill_score(skill_vectors, caregiver_rows),
+            'rating': np.broadcast_to(self._calculate_rating_score(
+                caregivers['average_rating'].to_numpy(dtype=float)), shape),
+            'experience': np.broadcast_to(self._calculate_experience_score(
+                caregivers['experience_years'].to_numpy(dtype=float)), shape),
+            'gender': self._calculate_gender_score(
+                genders, caregivers['gender'].to_numpy(dtype=object)),
+            'language': self._calculate_language_score(
+                area_rows, self.caregiver_area_codes[caregiver_rows])
+        }
+    
+    @staticmethod
+    def _total_score(components: Dict) -> np.ndarray:
+        """Sum score components (same order on every path, so totals match)."""
+        return (
+            components['distance'] + 
+            components['skill'] + 
+            components['rating'] + 
+            components['experience'] + 
+            components['gender'] + 
+            components['language']
+        )
     
     def _check_availability(self, caregiver_id: str, 
                            booking_date: str, 
@@ -285,6 +1060,197 @@ class CaregiverMatcher:
             print(f"Warning: Error checking availability: {e}")
             return True  # Assume available if check fails
     
+    def _resolve_query(self,
+                       senior_id: str = None,
+                       senior_lat: float = None,
+                       senior_lon: float = None,
+                       required_skills: List[str] = None,
+                       senior_gender: str = None,
+                       senior_area: str = None,
+                       booking_date: str = None,
+                       start_time: str = "09:00:00",
+                       duration_hrs: int = 4) -> Dict:
+        """
+        Resolve match arguments into a query with per-caregiver
+        distance and language score arrays.
+        
+        Raises:
+            ValueError: If the senior ID is unknown or coordinates are missing
+        """
+        skill_vector = None
+        
+        # If senior_id provided, use the precomputed profile
+        if senior_id:
+            senior = self.get_senior_profile(senior_id)
+            
+            senior_lat = senior['latitude']
+            senior_lon = senior['longitude']
+            senior_gender = senior['gender']
+            senior_area = senior['area']
+            
+            if required_skills is None:
+                required_skills = senior['required_skills']
+                skill_vector = senior['skill_vector']
+        
+        # Default values
+        if required_skills is None:
+            required_skills = list(self.DEFAULT_SKILLS)
+        if skill_vector is None:
+            skill_vector = self._skill_vector(required_skills)
+        if booking_date is None:
+            booking_date = datetime.now().strftime('%Y-%m-%d')
+        self._ensure_bookings_loaded(booking_date)
+        
+        # Validate coordinates
+        if pd.isna(senior_lat) or pd.isna(senior_lon):
+            raise ValueError("Senior location coordinates are required")
+        
+        print(f"\n{'='*60}")
+        print(f"Matching caregivers for senior at ({senior_lat}, {senior_lon})")
+        print(f"Required skills: {', '.join(required_skills)}")
+        print(f"Booking: {booking_date} at {start_time} for {duration_hrs}h")
+        print(f"{'='*60}\n")
+        
+        area_row = self._area_similarity_row(senior_area)
+        if area_row is None:
+            area_row = np.zeros(len(self.area_names))
+        
+        components = self._component_scores(
+            [senior_lat], [senior_lon], [skill_vector],
+            np.array([senior_gender], dtype=object), [area_row],
+            np.arange(len(self.caregivers_df))
+        )
+        components = {
+            k: None if v is None else v[0] for k, v in components.items()
+        }
+        if components['travel_min'] is not None and np.isnan(components['travel_min']).all():
+            components['travel_min'] = None
+        
+        return {
+            'senior_lat': senior_lat,
+            'senior_lon': senior_lon,
+            'senior_gender': senior_gender,
+            'required_skills': required_skills,
+            'skill_vector': skill_vector,
+            'booking_date': booking_date,
+            'start_time': start_time,
+            'duration_hrs': duration_hrs,
+            # Distances (NaN where location is missing)
+            'distances': components['distance_km'],
+            'travel_minutes': components['travel_min'],
+            # Score components for all caregivers
+            'components': components
+        }
+    
+    def _score_caregiver(self, idx: int, query: Dict) -> Tuple[float, Dict]:
+        """
+        Score one caregiver against a resolved query.
+        
+        Returns:
+            (unrounded total score, match dictionary)
+        """
+        caregiver = self.caregivers_df.iloc[idx].to_dict()
+        distance_km = query['distances'][idx]
+        
+        # Component scores precomputed for all caregivers
+        scores = {
+            name: float(values[idx])
+            for name, values in query['components'].items()
+            if name not in ('distance_km', 'travel_min')
+        }
+        distance_score = scores['distance']
+        skill_score = scores['skill']
+        rating_score = scores['rating']
+        experience_score = scores['experience']
+        gender_score = scores['gender']
+        language_score = scores['language']
+        total_score = self._total_score(scores)
+        
+        # Check availability
+        is_available = self._check_availability(
+            caregiver['id'], 
+            query['booking_date'], 
+            query['start_time'], 
+            query['duration_hrs']
+        )
+        
+        # Build result
+        match = {
+            'caregiver_id': caregiver['id'],
+            'name': caregiver['full_name'],
+            'distance_km': round(distance_km, 2),
+            'total_score': round(total_score, 2),
+            'available': is_available,
+            'breakdown': {
+                'distance': round(distance_score, 2),
+                'skill': round(skill_score, 2),
+                'rating': round(rating_score, 2),
+                'experience': round(experience_score, 2),
+                'gender': round(gender_score, 2),
+                'language': round(language_score, 2)
+            },
+            'details': {
+                'phone': caregiver['phone'],
+                'email': caregiver['email'],
+                'experience_years': int(caregiver['experience_years']),
+                'average_rating': round(caregiver['average_rating'], 2),
+                'total_reviews': int(caregiver['total_reviews']),
+                'hourly_rate': int(caregiver['hourly_rate']),
+                'services': caregiver['services'].split('|'),
+                'area': caregiver['area']
+            }
+        }
+        
+        if query['travel_minutes'] is not None:
+            travel_min = query['travel_minutes'][idx]
+            match['travel_min'] = round(float(travel_min), 1) if np.isfinite(travel_min) else None
+        
+        # Generate human-readable reason
+        reasons = []
+        
+        if query['travel_minutes'] is not None:
+            # Same distance scores as 3 km / 10 km in a straight line;
+            # unreachable caregivers get no proximity reason
+            travel_min = match['travel_min']
+            if travel_min is not None and travel_min < 6:
+                reasons.append(f"খুব কাছাকাছি ({travel_min:.0f} মিনিট)")
+            elif travel_min is not None and travel_min < 20:
+                reasons.append(f"কাছাকাছি এলাকায় ({travel_min:.0f} মিনিট)")
+        elif distance_km < 3:
+            reasons.append(f"খুব কাছাকাছি ({distance_km:.1f} কিমি)")
+        elif distance_km < 10:
+            reasons.append(f"কাছাকাছি এলাকায় ({distance_km:.1f} কিমি)")
+        
+        if skill_score > 20:
+            reasons.append("প্রয়োজনীয় দক্ষতা রয়েছে")
+        
+        if rating_score > 15:
+            reasons.append(f"উচ্চ রেটিং ({caregiver['average_rating']:.1f}/5)")
+        
+        if experience_score > 10:
+            reasons.append(f"{int(caregiver['experience_years'])} বছরের অভিজ্ঞতা")
+        
+        if gender_score > 0:
+            reasons.append("জেন্ডার ম্যাচ")
+        
+        if language_score >= self.SAME_AREA_SCORE:
+            reasons.append("একই এলাকা")
+        elif language_score > 0:
+            reasons.append("পার্শ্ববর্তী এলাকা")
+        
+        if not is_available:
+            reasons.append("⚠ সময়সূচী দ্বন্দ্ব")
+        
+        match['reason'] = '; '.join(reasons) if reasons else "ভালো বিকল্প"
+        
+        return total_score, match
+    
+    @staticmethod
+    def _rank_matches(matches: List[Dict]) -> List[Dict]:
+        """Sort by score (descending) with available caregivers first."""
+        return sorted(matches, key=lambda x: (x['available'], x['total_score']), 
+                      reverse=True)
+    
     def match_caregivers(self, 
                         senior_id: str = None,
                         senior_lat: float = None, 
@@ -314,173 +1280,324 @@ class CaregiverMatcher:
         Returns:
             List of dictionaries with caregiver details and scores
         """
-        # If senior_id provided, look up details
-        if senior_id:
-            senior = self.seniors_df[
-                self.seniors_df['id'] == senior_id
-            ].iloc[0]
-            
-            senior_lat = senior['latitude']
-            senior_lon = senior['longitude']
-            senior_gender = senior['gender']
-            senior_area = senior['area']
-            
-            # Extract required skills from medical conditions
-            if required_skills is None:
-                medical_conditions = senior.get('medical_conditions', '')
-                if pd.notna(medical_conditions):
-                    # Map medical conditions to services
-                    condition_to_service = {
-                        'ডায়াবেটিস': 'Diabetes Care',
-                        'উচ্চ রক্তচাপ': 'Blood Pressure Monitoring',
-                        'ডিমেনশিয়া': 'Dementia Care',
-                        'পারকিনসন্স': 'Palliative Care',
-                        'স্ট্রোক': 'Post-Surgery Care',
-                        'আর্থ্রাইটিস': 'Mobility Assistance',
-                        'হৃদরোগ': 'Nursing'
-                    }
-                    
-                    conditions = medical_conditions.split('|')
-                    required_skills = [
-                        condition_to_service.get(c.strip(), 'Personal Care') 
-                        for c in conditions
-                    ]
-                    
-                    # Add basic services
-                    required_skills.extend([
-                        'Personal Care', 
-                        'Companionship',
-                        'Medication Management'
-                    ])
-                    required_skills = list(set(required_skills))
+        query = self._resolve_query(
+            senior_id, senior_lat, senior_lon, required_skills,
+            senior_gender, senior_area, booking_date, start_time,
+            duration_hrs
+        )
         
-        # Default values
-        if required_skills is None:
-            required_skills = ['Personal Care', 'Companionship']
-        if booking_date is None:
-            booking_date = datetime.now().strftime('%Y-%m-%d')
+        # Registered seniors with derived skills use the precomputed list
+        if senior_id and required_skills is None:
+            matches = self._match_from_candidates(senior_id, query, top_n)
+            if matches is not None:
+                return matches
         
-        # Validate coordinates
-        if pd.isna(senior_lat) or pd.isna(senior_lon):
-            raise ValueError("Senior location coordinates are required")
+        # Calculate scores for all caregivers with a known location
+        matches = []
         
-        print(f"\n{'='*60}")
-        print(f"Matching caregivers for senior at ({senior_lat}, {senior_lon})")
-        print(f"Required skills: {', '.join(required_skills)}")
-        print(f"Booking: {booking_date} at {start_time} for {duration_hrs}h")
-        print(f"{'='*60}\n")
+        for idx in np.flatnonzero(~np.isnan(query['distances'])):
+            _, match = self._score_caregiver(idx, query)
+            matches.append(match)
         
-        # Calculate scores for all caregivers
-        matches = []
+        # Return top N
+        return self._rank_matches(matches)[:top_n]
+    
+    def match_caregivers_progressive(self,
+                                     senior_id: str = None,
+                                     senior_lat: float = None,
+                                     senior_lon: float = None,
+                                     required_skills: List[str] = None,
+                                     senior_gender: str = None,
+                                     senior_area: str = None,
+                                     booking_date: str = None,
+                                     start_time: str = "09:00:00",
+                                     duration_hrs: int = 4,
+                                     top_n: int = 5,
+                                     time_budget_ms: float = 200.0) -> Dict:
+        """
+        Anytime variant of match_caregivers() for strict latency budgets.
         
-        for idx, caregiver in self.caregivers_df.iterrows():
-            # Skip if missing location
-            if pd.isna(caregiver['latitude']) or pd.isna(caregiver['longitude']):
-                continue
+        All score components except availability are cheap array
+        operations and are computed for every caregiver up front; only
+        the availability check runs per caregiver. Caregivers are
+        checked in descending score order (like match_caregivers_page())
+        while a running top-N is kept. Scanning stops when the time
+        budget expires, or when the next caregiver's score cannot beat
+        the current N-th available match.
+        
+        The budget covers the whole call, including resolving the query
+        and paging in bookings. If it cuts the scan short (exact is
+        False), matches can hold fewer than top_n caregivers.
+        
+        Args:
+            Same as match_caregivers(), plus:
+            time_budget_ms: Time budget for the call in milliseconds
+        
+        Returns:
+            Dictionary with:
+            - matches: Ranked matches (same format as match_caregivers);
+              may be shorter than top_n when exact is False
+            - exact: True if the result equals a full scan
+            - candidates_examined: Number of caregivers scored
+            - total_candidates: Number of caregivers with a location
+            - elapsed_ms: Time spent in the call
+        """
+        start = time.perf_counter()
+        deadline = start + time_budget_ms / 1000.0
+        
+        query = self._resolve_query(
+            senior_id, senior_lat, senior_lon, required_skills,
+            senior_gender, senior_area, booking_date, start_time,
+            duration_hrs
+        )
+        
+        # Highest (rounded) score first; ties keep caregiver order
+        candidates = np.flatnonzero(~np.isnan(query['distances']))
+        scores = self._query_scores(query)[candidates]
+        order = np.argsort(-scores, kind='stable')
+        candidates, scores = candidates[order], scores[order]
+        
+        # Min-heap of (available, rounded score, -idx, match), ranked like
+        # match_caregivers(); heap[0] is the N-th best
+        top = []
+        examined = 0
+        exact = True
+        
+        for pos, idx in enumerate(candidates):
+            if len(top) >= top_n:
+                kth_available, kth_score = top[0][0], top[0][1]
+                # Later caregivers score no higher, and a tie loses on
+                # caregiver order to every kept match
+                if kth_available and scores[pos] <= kth_score:
+                    break
             
-            # Calculate distance
-            distance_km = self.haversine_distance(
-                senior_lat, senior_lon,
-                caregiver['latitude'], caregiver['longitude']
-            )
+            if examined and time.perf_counter() >= deadline:
+                exact = False
+                break
             
-            # Calculate component scores
-            distance_score = self._calculate_distance_score(distance_km)
-            skill_score = self._calculate_skill_score(required_skills, idx)
-            rating_score = self._calculate_rating_score(
-                caregiver['average_rating']
-            )
-            experience_score = self._calculate_experience_score(
-                caregiver['experience_years']
-            )
-            gender_score = self._calculate_gender_score(
-                senior_gender, caregiver['gender']
-            )
-            language_score = self._calculate_language_score(
-                senior_area, caregiver['area']
-            )
+            _, match = self._score_caregiver(idx, query)
+            examined += 1
             
-            # Calculate total score
-            total_score = (
-                distance_score + 
-                skill_score + 
-                rating_score + 
-                experience_score + 
-                gender_score + 
-                language_score
-            )
+            entry = (match['available'], match['total_score'], -idx, match)
+            if len(top) < top_n:
+                heapq.heappush(top, entry)
+            elif entry[:3] > top[0][:3]:
+                heapq.heapreplace(top, entry)
+        
+        # Rank in caregiver order so ties resolve like a full scan
+        kept = [entry[3] for entry in sorted(top, key=lambda e: -e[2])]
+        
+        return {
+            'matches': self._rank_matches(kept)[:top_n],
+            'exact': exact,
+            'candidates_examined': examined,
+            'total_candidates': len(candidates),
+            'elapsed_ms': round((time.perf_counter() - start) * 1000.0, 2)
+        }
+    
+    def _query_scores(self, query: Dict) -> np.ndarray:
+        """
+        Total scores (everything except availability) for all
+        caregivers against a resolved query, rounded like match results.
+        Caregivers without a location score NaN.
+        """
+        scores = np.round(self._total_score(query['components']), 2)
+        return np.where(np.isnan(query['distances']), np.nan, scores)
+    
+    def _extend_result_set(self, result_set: Dict, count: int):
+        """
+        Grow a result set's ranked matches to at least `count` entries.
+        
+        Caregivers are ranked by score in chunks (argpartition over the
+        not-yet-ranked rest), then checked for availability in that
+        order. Busy caregivers are held back until every available one
+        has been emitted, matching the ordering of match_caregivers().
+        """
+        query = result_set['query']
+        scores = result_set['scores']
+        
+        while len(result_set['matches']) < count and not result_set['done']:
+            if result_set['scanned'] < len(result_set['ranked']):
+                idx = result_set['ranked'][result_set['scanned']]
+                result_set['scanned'] += 1
+                _, match = self._score_caregiver(idx, query)
+                if match['available']:
+                    result_set['matches'].append(match)
+                else:
+                    result_set['busy'].append(match)
             
-            # Check availability
-            is_available = self._check_availability(
-                caregiver['id'], 
-                booking_date, 
-                start_time, 
-                duration_hrs
-            )
+            elif len(result_set['unranked']):
+                # Rank the next chunk of best-scoring caregivers
+                unranked = result_set['unranked']
+                size = min(len(unranked), max(count, self.RANKING_CHUNK))
+                if size < len(unranked):
+                    part = np.argpartition(-scores[unranked], size - 1)
+                    chunk, rest = unranked[part[:size]], unranked[part[size:]]
+                    # Include ties with the chunk boundary so order stays stable
+                    boundary = scores[chunk].min()
+                    ties = scores[rest] == boundary
+                    chunk, rest = np.concatenate([chunk, rest[ties]]), rest[~ties]
+                else:
+                    chunk, rest = unranked, unranked[:0]
+                
+                chunk = chunk[np.lexsort((chunk, -scores[chunk]))]
+                result_set['ranked'] = np.concatenate([result_set['ranked'], chunk])
+                result_set['unranked'] = rest
             
-            # Build result
-            match = {
-                'caregiver_id': caregiver['id'],
-                'name': caregiver['full_name'],
-                'distance_km': round(distance_km, 2),
-                'total_score': round(total_score, 2),
-                'available': is_available,
-                'breakdown': {
-                    'distance': round(distance_score, 2),
-                    'skill': round(skill_score, 2),
-                    'rating': round(rating_score, 2),
-                    'experience': round(experience_score, 2),
-                    'gender': round(gender_score, 2),
-                    'language': round(language_score, 2)
-                },
-                'details': {
-                    'phone': caregiver['phone'],
-                    'email': caregiver['email'],
-                    'experience_years': int(caregiver['experience_years']),
-                    'average_rating': round(caregiver['average_rating'], 2),
-                    'total_reviews': int(caregiver['total_reviews']),
-                    'hourly_rate': int(caregiver['hourly_rate']),
-                    'services': caregiver['services'].split('|'),
-                    'area': caregiver['area']
-                }
+            else:
+                result_set['matches'].extend(result_set['busy'])
+                result_set['busy'] = []
+                result_set['done'] = True
+    
+    @staticmethod
+    def _encode_cursor(token: str, offset: int, query_args: Dict) -> str:
+        """Encode a resumable pagination cursor."""
+        payload = json.dumps(
+            {'token': token, 'offset': offset, 'query': query_args},
+            ensure_ascii=False
+        )
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Dict:
+        """
+        Decode and validate a cursor from _encode_cursor().
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            state = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except (ValueError, UnicodeError, AttributeError) as e:
+            raise ValueError(f"Invalid cursor: {e}")
+        
+        if not isinstance(state, dict) or set(state) != {'token', 'offset', 'query'}:
+            raise ValueError("Invalid cursor: unexpected payload")
+        if not isinstance(state['token'], str):
+            raise ValueError("Invalid cursor: bad token")
+        offset = state['offset']
+        if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+            raise ValueError("Invalid cursor: offset must be a non-negative integer")
+        
+        query = state['query']
+        if not isinstance(query, dict) or set(query) != set(CaregiverMatcher.CURSOR_QUERY_TYPES):
+            raise ValueError("Invalid cursor: unexpected query fields")
+        for key, types in CaregiverMatcher.CURSOR_QUERY_TYPES.items():
+            value = query[key]
+            if value is not None and (
+                not isinstance(value, types) or isinstance(value, bool)
+            ):
+                raise ValueError(f"Invalid cursor: bad value for {key}")
+        if query['required_skills'] is not None and not all(
+            isinstance(skill, str) for skill in query['required_skills']
+        ):
+            raise ValueError("Invalid cursor: bad value for required_skills")
+        
+        return state
+    
+    def match_caregivers_page(self,
+                              senior_id: str = None,
+                              senior_lat: float = None,
+                              senior_lon: float = None,
+                              required_skills: List[str] = None,
+                              senior_gender: str = None,
+                              senior_area: str = None,
+                              booking_date: str = None,
+                              start_time: str = "09:00:00",
+                              duration_hrs: int = 4,
+                              page_size: int = 5,
+                              cursor: str = None) -> Dict:
+        """
+        Page through ranked matches ("show more caregivers").
+        
+        The first call takes the usual match arguments; later calls pass
+        only the returned cursor. Ranked result sets are kept in a small
+        LRU cache (RESULT_CACHE_SIZE entries, RESULT_CACHE_TTL_SEC
+        seconds) and later pages extend the ranking instead of
+        recomputing it. Cursors also carry the query, so an evicted
+        result set is rebuilt and resumed at the same offset.
+        
+        Returns:
+            Dictionary with:
+            - matches: This page of matches (same format as match_caregivers)
+            - next_cursor: Cursor for the next page, or None if exhausted
+            - total_candidates: Number of caregivers with a location
+        
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        now = time.monotonic()
+        
+        # Drop expired result sets (LRU order is by access, not creation)
+        expired = [
+            token for token, result_set in self._result_cache.items()
+            if now - result_set['created'] > self.RESULT_CACHE_TTL_SEC
+        ]
+        for token in expired:
+            self._result_cache.pop(token)
+        
+        if cursor:
+            state = self._decode_cursor(cursor)
+            token, offset, query_args = state['token'], state['offset'], state['query']
+        else:
+            if booking_date is None:
+                booking_date = datetime.now().strftime('%Y-%m-%d')
+            token = secrets.token_urlsafe(12)
+            offset = 0
+            query_args = {
+                'senior_id': senior_id,
+                'senior_lat': senior_lat,
+                'senior_lon': senior_lon,
+                'required_skills': required_skills,
+                'senior_gender': senior_gender,
+                'senior_area': senior_area,
+                'booking_date': booking_date,
+                'start_time': start_time,
+                'duration_hrs': duration_hrs
             }
+        
+        result_set = self._result_cache.get(token)
+        if result_set is None:
+            query = self._resolve_query(**query_args)
+            scores = self._query_scores(query)
+            result_set = {
+                'created': now,
+                'query': query,
+                'scores': scores,
+                'ranked': np.array([], dtype=int),
+                'unranked': np.flatnonzero(~np.isnan(scores)),
+                'scanned': 0,
+                'matches': [],
+                'busy': [],
+                'done': False
+            }
+            result_set['total_candidates'] = len(result_set['unranked'])
+            self._result_cache[token] = result_set
             
-            # Generate human-readable reason
-            reasons = []
-            
-            if distance_km < 3:
-                reasons.append(f"খুব কাছাকাছি ({distance_km:.1f} কিমি)")
-            elif distance_km < 10:
-                reasons.append(f"কাছাকাছি এলাকায় ({distance_km:.1f} কিমি)")
-            
-            if skill_score > 20:
-                reasons.append("প্রয়োজনীয় দক্ষতা রয়েছে")
-            
-            if rating_score > 15:
-                reasons.append(f"উচ্চ রেটিং ({caregiver['average_rating']:.1f}/5)")
-            
-            if experience_score > 10:
-                reasons.append(f"{int(caregiver['experience_years'])} বছরের অভিজ্ঞতা")
-            
-            if gender_score > 0:
-                reasons.append("জেন্ডার ম্যাচ")
-            
-            if language_score > 0:
-                reasons.append("একই এলাকা")
-            
-            if not is_available:
-                reasons.append("⚠ সময়সূচী দ্বন্দ্ব")
-            
-            match['reason'] = '; '.join(reasons) if reasons else "ভালো বিকল্প"
-            
-            matches.append(match)
+            # Evict least recently used result sets
+            while len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        else:
+            self._result_cache.move_to_end(token)
+            # Other queries may have reloaded bookings since the last page
+            self._ensure_bookings_loaded(result_set['query']['booking_date'])
         
-        # Sort by score (descending) and filter available first
-        matches.sort(key=lambda x: (x['available'], x['total_score']), 
-                    reverse=True)
+        end = offset + page_size
+        self._extend_result_set(result_set, end)
         
-        # Return top N
-        return matches[:top_n]
+        has_more = end < len(result_set['matches']) or not result_set['done']
+        if has_more and not result_set['done']:
+            # Peek one ahead so the last page does not return a dead cursor
+            self._extend_result_set(result_set, end + 1)
+            has_more = end < len(result_set['matches'])
+        
+        return {
+            'matches': result_set['matches'][offset:end],
+            'next_cursor': (
+                self._encode_cursor(token, end, query_args) if has_more else None
+            ),
+            'total_candidates': result_set['total_candidates']
+        }
     
     def print_matches(self, matches: List[Dict]):
         """Pretty print matching results."""
@@ -492,7 +1609,8 @@ class CaregiverMatcher:
             status = "[AVAILABLE]" if match['available'] else "[BUSY]"
             
             print(f"{i}. {match['name']} [{status}]")
-            print(f"   Score: {match['total_score']:.1f}/100 | Distance: {match['distance_km']} km")
+            travel = f" | Travel: {match['travel_min']} min" if match.get('travel_min') is not None else ""
+            print(f"   Score: {match['total_score']:.1f}/100 | Distance: {match['distance_km']} km{travel}")
             print(f"   Phone: {match['details']['phone']} | Rate: ৳{match['details']['hourly_rate']}/hr")
             print(f"   Experience: {match['details']['experience_years']} years | "
                   f"Rating: {match['details']['average_rating']}/5 "
@@ -558,7 +1676,6 @@ def main():
 
 if __name__ == '__main__':
     import argparse
-    import json
     
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Sheba Caregiver Matching Algorithm')
@@ -572,13 +1689,34 @@ if __name__ == '__main__':
     parser.add_argument('--start_time', type=str, help='Start time (HH:MM:SS)')
     parser.add_argument('--duration_hrs', type=int, default=4, help='Duration in hours')
     parser.add_argument('--top_n', type=int, default=5, help='Number of matches to return')
+    parser.add_argument('--paginate', action='store_true', help='Return a cursor for the next page of matches')
+    parser.add_argument('--cursor', type=str, help='Cursor from a previous page (other match arguments are ignored)')
+    parser.add_argument('--time_budget_ms', type=float, help='Latency budget in ms (enables progressive matching)')
+    parser.add_argument('--db', type=str, help='Read from a SQLite store instead of the CSV files')
+    parser.add_argument('--district', type=str, help='Only load caregivers in this district')
+    parser.add_argument('--road_network', type=str, help='OSM XML road network for travel-time distance scoring')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
     parser.add_argument('--stats', action='store_true', help='Get algorithm statistics')
     
     args = parser.parse_args()
     
+    # A match request only needs the week starting at the booking date
+    # (stats report every booking)
+    bookings_from = bookings_to = None
+    if args.json and not args.stats:
+        window_start = pd.to_datetime(args.booking_date or datetime.now().date())
+        window_end = window_start + timedelta(days=CaregiverMatcher.BOOKING_PAGE_DAYS - 1)
+        bookings_from = window_start.strftime('%Y-%m-%d')
+        bookings_to = window_end.strftime('%Y-%m-%d')
+    
     # Initialize matcher
-    matcher = CaregiverMatcher()
+    matcher = CaregiverMatcher(
+        data_source=SQLiteDataSource(args.db) if args.db else None,
+        district=args.district,
+        bookings_from=bookings_from,
+        bookings_to=bookings_to,
+        road_network=args.road_network
+    )
     
     # Handle stats request
     if args.stats:
@@ -608,7 +1746,7 @@ if __name__ == '__main__':
     if args.json:
         # JSON mode for API
         try:
-            matches = matcher.match_caregivers(
+            match_args = dict(
                 senior_id=args.senior_id,
                 senior_lat=args.senior_lat,
                 senior_lon=args.senior_lon,
@@ -621,9 +1759,25 @@ if __name__ == '__main__':
                 top_n=args.top_n
             )
             
+            if args.paginate or args.cursor:
+                match_args['page_size'] = match_args.pop('top_n')
+                progress = matcher.match_caregivers_page(
+                    cursor=args.cursor, **match_args
+                )
+                matches = progress.pop('matches')
+            elif args.time_budget_ms is not None:
+                progress = matcher.match_caregivers_progressive(
+                    time_budget_ms=args.time_budget_ms, **match_args
+                )
+                matches = progress.pop('matches')
+            else:
+                matches = matcher.match_caregivers(**match_args)
+                progress = {}
+            
             result = {
                 'success': True,
                 'matches': matches,
+                **progress,
                 'total_caregivers': len(matcher.caregivers_df),
                 'query': {
                     'senior_id': args.senior_id,
@@ -0,0 +1,365 @@
+"""
+Road-network travel times for the Sheba caregiver matching algorithm.
+
+Straight-line (haversine) distance ranks caregivers badly in Dhaka, where
+river crossings and traffic corridors dominate travel time. This module
+loads a road graph from a local OpenStreetMap XML extract (.osm) and
+precomputes caregiver -> grid cell travel times with multi-source
+shortest paths, cached on disk. At query time the senior's location is
+mapped to a grid cell, so a travel time is a constant-time array lookup.
+A cached table is loaded without parsing the road file; the graph is only
+loaded when a caregiver is added or moves.
+
+Author: Sheba Development Team
+Date: November 2025
+"""
+
+import hashlib
+import xml.etree.ElementTree as ET
+import numpy as np
+from pathlib import Path
+from typing import Dict, Tuple
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from scipy.spatial import cKDTree
+
+EARTH_RADIUS_KM = 6371.0
+
+# Typical urban speeds (km/h) by OSM highway type when maxspeed is missing
+DEFAULT_SPEEDS_KMH = {
+    'motorway': 50.0,
+    'trunk': 35.0,
+    'primary': 25.0,
+    'secondary': 20.0,
+    'tertiary': 18.0,
+    'unclassified': 15.0,
+    'residential': 12.0,
+    'service': 10.0,
+    'living_street': 8.0,
+    'motorway_link': 30.0,
+    'trunk_link': 25.0,
+    'primary_link': 20.0,
+    'secondary_link': 18.0,
+    'tertiary_link': 15.0,
+}
+
+# Speed (km/h) for getting from a point to the nearest road node
+ACCESS_SPEED_KMH = 5.0
+
+# Sources per Dijkstra batch (bounds the size of the distance matrix)
+DIJKSTRA_BATCH = 16
+
+# Part of the cache key; bump when the cached arrays change
+CACHE_FORMAT = 2
+
+
+def _project(lats: np.ndarray, lons: np.ndarray, ref_lat: float) -> np.ndarray:
+    """Equirectangular projection to kilometres (fine at city scale)."""
+    lats = np.radians(np.asarray(lats, dtype=float))
+    lons = np.radians(np.asarray(lons, dtype=float))
+    x = EARTH_RADIUS_KM * lons * np.cos(np.radians(ref_lat))
+    y = EARTH_RADIUS_KM * lats
+    return np.column_stack([x, y])
+
+
+def _parse_speed(way_tags: Dict[str, str]) -> float:
+    """Speed in km/h from a way's maxspeed or highway tag."""
+    maxspeed = way_tags.get('maxspeed', '').split()
+    if maxspeed:
+        try:
+            speed = float(maxspeed[0])
+            if len(maxspeed) > 1 and maxspeed[1] == 'mph':
+                speed *= 1.609
+            return speed
+        except ValueError:
+            pass
+    return DEFAULT_SPEEDS_KMH.get(way_tags['highway'])
+
+
+def _fingerprint(path: Path) -> str:
+    """Identifier of a file's contents (for cache keys), without reading it."""
+    stat = path.stat()
+    return f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class RoadGraph:
+    """
+    Drivable road graph loaded from an OSM XML extract.
+
+    Nodes are road junctions/shape points; edge weights are travel
+    times in minutes.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Path to an OpenStreetMap XML file (.osm)
+
+        Raises:
+            ValueError: If the file has no drivable roads
+        """
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Road network file not found: {self.path}")
+
+        print(f"Loading road network from {self.path}...")
+        node_coords, ways = self._parse_osm()
+
+        # Keep only nodes used by drivable ways
+        used = sorted({ref for refs, _, _ in ways for ref in refs if ref in node_coords})
+        if not used:
+            raise ValueError(f"no drivable roads in {self.path}")
+        index = {ref: i for i, ref in enumerate(used)}
+        coords = np.array([node_coords[ref] for ref in used], dtype=float).reshape(-1, 2)
+
+        self.lats, self.lons = coords[:, 0], coords[:, 1]
+        self.ref_lat = float(np.mean(self.lats))
+        self.points = _project(self.lats, self.lons, self.ref_lat)
+
+        rows, cols, weights = [], [], []
+        for refs, speed, oneway in ways:
+            refs = [index[r] for r in refs if r in index]
+            for a, b in zip(refs, refs[1:]):
+                minutes = np.linalg.norm(self.points[a] - self.points[b]) / speed * 60.0
+                rows.append(a)
+                cols.append(b)
+                weights.append(minutes)
+                if not oneway:
+                    rows.append(b)
+                    cols.append(a)
+                    weights.append(minutes)
+
+        n = len(used)
+        self.graph = csr_matrix((weights, (rows, cols)), shape=(n, n))
+        self.tree = cKDTree(self.points)
+
+        print(f"[OK] Loaded {n} road nodes and {len(weights)} directed segments")
+
+    def _parse_osm(self) -> Tuple[Dict[int, Tuple[float, float]], list]:
+        """Stream the OSM file into node coordinates and drivable ways."""
+        node_coords = {}
+        ways = []
+
+        for _, elem in ET.iterparse(self.path, events=('end',)):
+            if elem.tag == 'node':
+                node_coords[int(elem.get('id'))] = (
+                    float(elem.get('lat')), float(elem.get('lon'))
+                )
+                elem.clear()
+            elif elem.tag == 'way':
+                tags = {t.get('k'): t.get('v') for t in elem.findall('tag')}
+                if tags.get('highway') in DEFAULT_SPEEDS_KMH:
+                    refs = [int(nd.get('ref')) for nd in elem.findall('nd')]
+                    oneway = tags.get('oneway') in ('yes', 'true', '1')
+                    speed = _parse_speed(tags)
+                    if len(refs) > 1 and speed:
+                        ways.append((refs, speed, oneway))
+                elem.clear()
+
+        return node_coords, ways
+
+    def snap(self, lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Nearest road node for each point.
+
+        Returns:
+            (node indices, access time in minutes from point to node)
+        """
+        points = _project(lats, lons, self.ref_lat)
+        distances_km, nodes = self.tree.query(points)
+        return nodes, distances_km / ACCESS_SPEED_KMH * 60.0
+
+    def travel_minutes(self, source_nodes: np.ndarray,
+                       target_nodes: np.ndarray) -> np.ndarray:
+        """
+        Shortest travel times from each source node to each target node,
+        computed with batched multi-source Dijkstra.
+
+        Returns:
+            Array of shape (len(source_nodes), len(target_nodes))
+        """
+        source_nodes = np.asarray(source_nodes, dtype=int)
+        result = np.full((len(source_nodes), len(target_nodes)), np.inf)
+
+        unique_sources, inverse = np.unique(source_nodes, return_inverse=True)
+        for start in range(0, len(unique_sources), DIJKSTRA_BATCH):
+            batch = unique_sources[start:start + DIJKSTRA_BATCH]
+            dist = dijkstra(self.graph, directed=True, indices=batch)
+            for offset in range(len(batch)):
+                result[inverse == start + offset] = dist[offset, target_nodes]
+
+        return result
+
+
+class TravelTimeTable:
+    """
+    Precomputed caregiver -> grid cell travel times (minutes).
+
+    The grid covers the road network's bounding box with square cells
+    of cell_size_km. Each cell's centre is snapped to its nearest road
+    node, so a lookup only needs the senior's cell index.
+    """
+
+    def __init__(self, road_file: str, origin: np.ndarray, shape: Tuple[int, int],
+                 ref_lat: float, cell_size_km: float, minutes: np.ndarray = None):
+        """
+        Args:
+            road_file: OSM XML extract the grid was built from
+            origin: Projected (x, y) km of the grid's lower-left corner
+            shape: Grid (rows, cols)
+            ref_lat: Reference latitude of the projection
+            cell_size_km: Grid cell size in kilometres
+            minutes: Travel times, shape (caregivers, cells)
+        """
+        self.road_file = Path(road_file)
+        self.origin = np.asarray(origin, dtype=float)
+        self.shape = tuple(int(n) for n in shape)
+        self.ref_lat = float(ref_lat)
+        self.cell_size_km = float(cell_size_km)
+        if minutes is None:
+            minutes = np.zeros((0, self.shape[0] * self.shape[1]), dtype=np.float32)
+        self.minutes = minutes
+
+        # Road graph and cell snapping, loaded on first use
+        self._graph = None
+        self._cell_nodes = None
+        self._cell_access = None
+
+    @classmethod
+    def from_graph(cls, graph: RoadGraph, cell_size_km: float = 0.5) -> 'TravelTimeTable':
+        """Empty table with a grid covering a loaded road graph."""
+        mins = graph.points.min(axis=0)
+        maxs = graph.points.max(axis=0)
+        shape = (np.floor((maxs - mins) / cell_size_km).astype(int) + 1)[::-1]
+        table = cls(graph.path, mins, shape, graph.ref_lat, cell_size_km)
+        table._graph = graph
+        return table
+
+    def fingerprint(self) -> str:
+        """Identifier of the road file and grid (for cache keys)."""
+        return f"{_fingerprint(self.road_file)}:{self.cell_size_km}"
+
+    @property
+    def graph(self) -> RoadGraph:
+        """Road graph, with every cell centre snapped to it."""
+        if self._graph is None:
+            self._graph = RoadGraph(self.road_file)
+        if self._cell_nodes is None:
+            rows, cols = np.indices(self.shape)
+            centres = self.origin + (
+                np.column_stack([cols.ravel(), rows.ravel()]) + 0.5
+            ) * self.cell_size_km
+            _, self._cell_nodes = self._graph.tree.query(centres)
+            self._cell_access = (
+                np.linalg.norm(centres - self._graph.points[self._cell_nodes], axis=1)
+                / ACCESS_SPEED_KMH * 60.0
+            )
+        return self._graph
+
+    @classmethod
+    def load_or_build(cls, road_file: str,
+                      caregiver_lats: np.ndarray,
+                      caregiver_lons: np.ndarray,
+                      cache_dir: str = None,
+                      cell_size_km: float = 0.5) -> 'TravelTimeTable':
+        """
+        Load the travel-time table from the on-disk cache, or build and
+        cache it. The cache key covers the road file (size and mtime),
+        the caregiver locations and the cell size, so any change
+        triggers a rebuild. A cache hit does not parse the road file.
+
+        Args:
+            road_file: Path to an OSM XML extract
+            caregiver_lats, caregiver_lons: Caregiver coordinates (row order)
+            cache_dir: Directory for cached tables. Defaults to the
+                       road file's directory
+            cell_size_km: Grid cell size in kilometres
+        """
+        road_file = Path(road_file)
+        if not road_file.exists():
+            raise FileNotFoundError(f"Road network file not found: {road_file}")
+
+        coords = np.column_stack([
+            np.asarray(caregiver_lats, dtype=float),
+            np.asarray(caregiver_lons, dtype=float)
+        ])
+        key = hashlib.sha1(
+            f"{CACHE_FORMAT}:{_fingerprint(road_file)}:{cell_size_km}".encode('utf-8')
+            + coords.tobytes()
+        ).hexdigest()[:16]
+        cache_dir = Path(cache_dir) if cache_dir else road_file.parent
+        cache_path = cache_dir / f"{road_file.stem}.travel_{key}.npz"
+
+        if cache_path.exists():
+            with np.load(cache_path) as cached:
+                table = cls(road_file, cached['origin'], cached['shape'],
+                            cached['ref_lat'], cached['cell_size_km'],
+                            cached['minutes'])
+            print(f"[OK] Loaded travel times from {cache_path}")
+            return table
+
+        table = cls.from_graph(RoadGraph(road_file), cell_size_km)
+        table.minutes = table._caregiver_rows(coords[:, 0], coords[:, 1])
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            cache_path,
+            minutes=table.minutes,
+            origin=table.origin,
+            shape=np.array(table.shape),
+            ref_lat=table.ref_lat,
+            cell_size_km=table.cell_size_km
+        )
+        print(f"[OK] Cached travel times for {len(coords)} caregivers "
+              f"x {table.minutes.shape[1]} cells to {cache_path}")
+        return table
+
+    def _caregiver_rows(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Travel times from caregiver locations to every grid cell."""
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        rows = np.full((len(lats), self.minutes.shape[1]), np.inf, dtype=np.float32)
+
+        located = np.flatnonzero(~(np.isnan(lats) | np.isnan(lons)))
+        if len(located):
+            graph = self.graph
+            nodes, access = graph.snap(lats[located], lons[located])
+            rows[located] = (
+                graph.travel_minutes(nodes, self._cell_nodes)
+                + access[:, None] + self._cell_access[None, :]
+            )
+        return rows
+
+    def set_caregiver(self, row: int, lat: float, lon: float):
+        """
+        Recompute (or append, if row == number of rows) one caregiver's
+        travel times after it was added or moved.
+        """
+        minutes = self._caregiver_rows([lat], [lon])
+        if row == len(self.minutes):
+            self.minutes = np.vstack([self.minutes, minutes])
+        else:
+            self.minutes[row] = minutes[0]
+
+    def cells(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Grid cell index for each point, or -1 if outside the grid."""
+        points = _project(lats, lons, self.ref_lat)
+        col_row = np.floor((points - self.origin) / self.cell_size_km).astype(int)
+        cols, rows = col_row[:, 0], col_row[:, 1]
+        inside = (
+            (rows >= 0) & (rows < self.shape[0]) &
+            (cols >= 0) & (cols < self.shape[1])
+        )
+        return np.where(inside, rows * self.shape[1] + cols, -1)
+
+    def minutes_to(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """
+        Travel times from every caregiver to each point.
+
+        Returns:
+            Array of shape (number of caregivers, len(lats)); NaN where
+            a point is outside the grid
+        """
+        cells = self.cells(lats, lons)
+        minutes = self.minutes[:, np.clip(cells, 0, None)].astype(float)
+        minutes[:, cells < 0] = np.nan
+        return minutes